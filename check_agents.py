@@ -3,127 +3,184 @@
 Script to check and manage existing agents on LiveKit cloud
 """
 import asyncio
+import itertools
+import logging
 import os
-from dotenv import load_dotenv
-from pathlib import Path
+import re
+import sys
+from env_loader import load as load_env
 from livekit import api
 from livekit.protocol import room as room_proto
 import aiohttp
 
-# Load environment variables
-load_dotenv(dotenv_path=Path(__file__).parent / '.env')
+# Load environment variables (parsed once per process)
+load_env()
+
+logging.basicConfig(level=logging.INFO, format='%(message)s', stream=sys.stdout)
+logger = logging.getLogger("agent-check")
+
+# Bound concurrent LiveKit API calls so fan-out doesn't trip rate limits
+_API_CONCURRENCY = 16
+
+# Compiled once: one case-insensitive scan replaces two .lower() calls and
+# three substring checks per participant.
+_AGENT_RE = re.compile(r'agent|bot', re.IGNORECASE)
+_AGENT_KIND = room_proto.ParticipantInfo.Kind.AGENT
+
+def _is_agent(participant):
+    """Return True if the participant looks like an agent."""
+    if getattr(participant, 'kind', None) == _AGENT_KIND:
+        return True
+    return (
+        _AGENT_RE.search(participant.identity) is not None
+        or participant.name.startswith('Agent')
+    )
+
+def _partition_agents(participants):
+    """Split participants into (agents, regular) in one classification pass."""
+    flags = [_is_agent(p) for p in participants]
+    agents = list(itertools.compress(participants, flags))
+    regular = list(itertools.compress(participants, (not f for f in flags)))
+    return agents, regular
 
 async def check_and_cleanup_agents():
     """Check for existing agents and clean them up"""
-    print("🔍 Checking LiveKit cloud for existing agents...")
-    
+    logger.info("🔍 Checking LiveKit cloud for existing agents...")
+
     session = aiohttp.ClientSession()
     try:
         lkapi = api.LiveKitAPI(session=session)
-        
+        semaphore = asyncio.Semaphore(_API_CONCURRENCY)
+
+        async def _bounded(coro):
+            async with semaphore:
+                return await coro
+
         # List all rooms
         rooms_response = await lkapi.room.list_rooms(room_proto.ListRoomsRequest(names=[]))
-        print(f"📊 Found {len(rooms_response.rooms)} rooms")
-        
+        rooms = rooms_response.rooms
+        logger.info(f"📊 Found {len(rooms)} rooms")
+
+        # Fetch every room's participant list concurrently: each call is an
+        # independent HTTP round-trip, so gathering collapses N RTTs into ~1.
+        participants_per_room = await asyncio.gather(
+            *[
+                _bounded(lkapi.room.list_participants(
+                    room_proto.ListParticipantsRequest(room=room.name)
+                ))
+                for room in rooms
+            ],
+            return_exceptions=True,
+        )
+
         agents_found = False
         rooms_to_delete = []
-        
-        for room in rooms_response.rooms:
-            print(f"\n🏠 Checking room: {room.name}")
-            
-            # Get participants in this room
-            participants_response = await lkapi.room.list_participants(
-                room_proto.ListParticipantsRequest(room=room.name)
-            )
-            
+        agents_to_remove = []  # (room_name, identity) tuples
+
+        for room, participants_response in zip(rooms, participants_per_room):
+            logger.info(f"\n🏠 Checking room: {room.name}")
+
+            if isinstance(participants_response, Exception):
+                logger.info(f"   ❌ Failed to list participants: {str(participants_response)}")
+                continue
+
             participants = participants_response.participants
-            print(f"   👥 Participants: {len(participants)}")
-            
+
             # Check for agents (participants with kind AGENT or specific patterns)
-            agents_in_room = []
-            regular_participants = []
-            
-            for participant in participants:
-                # Check if this looks like an agent
-                is_agent = (
-                    hasattr(participant, 'kind') and participant.kind == room_proto.ParticipantInfo.Kind.AGENT
-                    or 'agent' in participant.identity.lower()
-                    or 'bot' in participant.identity.lower()
-                    or participant.name.startswith('Agent')
-                )
-                
-                if is_agent:
-                    agents_in_room.append(participant)
-                    print(f"   🤖 Agent found: {participant.identity} ({participant.name})")
-                else:
-                    regular_participants.append(participant)
-                    print(f"   👤 User: {participant.identity} ({participant.name})")
-            
-            # Remove agents from this room
+            agents_in_room, regular_participants = _partition_agents(participants)
+
+            # One buffered emit per room instead of a flushing print per
+            # participant; the per-participant detail is DEBUG so production
+            # runs skip the string-building entirely.
+            logger.info("   👥 Participants: %d (%d agent(s))",
+                        len(participants), len(agents_in_room))
+            if logger.isEnabledFor(logging.DEBUG):
+                lines = [f"   🤖 Agent found: {p.identity} ({p.name})" for p in agents_in_room]
+                lines += [f"   👤 User: {p.identity} ({p.name})" for p in regular_participants]
+                if lines:
+                    logger.debug("\n".join(lines))
+
             if agents_in_room:
                 agents_found = True
-                print(f"   🗑️  Removing {len(agents_in_room)} agent(s)...")
-                
-                for agent in agents_in_room:
-                    try:
-                        await lkapi.room.remove_participant(
-                            room_proto.RoomParticipantIdentity(
-                                room=room.name,
-                                identity=agent.identity
-                            )
-                        )
-                        print(f"      ✅ Removed: {agent.identity}")
-                    except Exception as e:
-                        print(f"      ❌ Failed to remove {agent.identity}: {str(e)}")
-            
+                logger.info(f"   🗑️  Removing {len(agents_in_room)} agent(s)...")
+                agents_to_remove.extend((room.name, agent.identity) for agent in agents_in_room)
+
             # Mark empty rooms for deletion
             if len(regular_participants) == 0:
                 rooms_to_delete.append(room.name)
-        
-        # Delete empty rooms
+
+        # Remove every agent in one concurrent batch
+        if agents_to_remove:
+            remove_results = await asyncio.gather(
+                *[
+                    _bounded(lkapi.room.remove_participant(
+                        room_proto.RoomParticipantIdentity(room=room_name, identity=identity)
+                    ))
+                    for room_name, identity in agents_to_remove
+                ],
+                return_exceptions=True,
+            )
+            for (room_name, identity), result in zip(agents_to_remove, remove_results):
+                if isinstance(result, Exception):
+                    logger.info(f"      ❌ Failed to remove {identity}: {str(result)}")
+                else:
+                    logger.info(f"      ✅ Removed: {identity}")
+
+        # Delete empty rooms, also as one batch
         if rooms_to_delete:
-            print(f"\n🧹 Cleaning up {len(rooms_to_delete)} empty room(s)...")
-            for room_name in rooms_to_delete:
-                try:
-                    await lkapi.room.delete_room(room_proto.DeleteRoomRequest(room=room_name))
-                    print(f"   ✅ Deleted room: {room_name}")
-                except Exception as e:
-                    print(f"   ❌ Failed to delete room {room_name}: {str(e)}")
-        
+            logger.info(f"\n🧹 Cleaning up {len(rooms_to_delete)} empty room(s)...")
+            delete_results = await asyncio.gather(
+                *[
+                    _bounded(lkapi.room.delete_room(room_proto.DeleteRoomRequest(room=room_name)))
+                    for room_name in rooms_to_delete
+                ],
+                return_exceptions=True,
+            )
+            for room_name, result in zip(rooms_to_delete, delete_results):
+                if isinstance(result, Exception):
+                    logger.info(f"   ❌ Failed to delete room {room_name}: {str(result)}")
+                else:
+                    logger.info(f"   ✅ Deleted room: {room_name}")
+
         if not agents_found:
-            print("\n✅ No existing agents found!")
+            logger.info("\n✅ No existing agents found!")
         else:
-            print(f"\n✅ Agent cleanup completed!")
-        
+            logger.info(f"\n✅ Agent cleanup completed!")
+
         return True
-        
+
     except Exception as e:
-        print(f"❌ Error: {str(e)}")
+        logger.info(f"❌ Error: {str(e)}")
         return False
     finally:
         await session.close()
 
 async def main():
     """Main function"""
-    print("🚀 LiveKit Agent Cleanup\n")
-    
-    # Verify credentials
-    required_vars = ['LIVEKIT_URL', 'LIVEKIT_API_KEY', 'LIVEKIT_API_SECRET']
-    missing_vars = [var for var in required_vars if not os.getenv(var)]
+    logger.info("🚀 LiveKit Agent Cleanup\n")
     
+    # Verify credentials; truthiness, not key presence, so VAR="" fails fast
+    required_vars = {'LIVEKIT_URL', 'LIVEKIT_API_KEY', 'LIVEKIT_API_SECRET'}
+    missing_vars = sorted(var for var in required_vars if not os.environ.get(var))
+
     if missing_vars:
-        print(f"❌ Missing environment variables: {', '.join(missing_vars)}")
+        logger.info(f"❌ Missing environment variables: {', '.join(missing_vars)}")
         return
     
-    print(f"🔗 Connected to: {os.getenv('LIVEKIT_URL')}")
+    logger.info(f"🔗 Connected to: {os.getenv('LIVEKIT_URL')}")
     
     # Check and cleanup
     success = await check_and_cleanup_agents()
     
     if success:
-        print("\n🎉 Ready to deploy new MCP agent!")
+        logger.info("\n🎉 Ready to deploy new MCP agent!")
     else:
-        print("\n⚠️  There were some issues during cleanup.")
+        logger.info("\n⚠️  There were some issues during cleanup.")
 
 if __name__ == "__main__":
+    try:
+        import uvloop
+        uvloop.install()  # libuv event loop: lower scheduling overhead than the default
+    except ImportError:
+        pass
     asyncio.run(main())
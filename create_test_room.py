@@ -3,12 +3,12 @@
 Create a test room and generate join link
 """
 import os
-from dotenv import load_dotenv
-from pathlib import Path
 from livekit import api
 
-# Load environment variables
-load_dotenv(dotenv_path=Path(__file__).parent / '.env')
+from env_loader import load as load_env
+
+# Load environment variables (parsed once per process)
+load_env()
 
 def generate_join_link(room_name="mcp-test-room", identity="test-user", name="Test User"):
     """Generate a join link for testing the agent"""
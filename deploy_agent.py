@@ -3,15 +3,18 @@
 Deploy the LiveKit MCP agent
 """
 import asyncio
+import io
 import os
+import select
 import subprocess
 import signal
 import sys
-from dotenv import load_dotenv
+import time
 from pathlib import Path
+from env_loader import load as load_env, REQUIRED_VARS
 
-# Load environment variables
-load_dotenv(dotenv_path=Path(__file__).parent / '.env')
+# Load environment variables (parsed once per process)
+load_env()
 
 class AgentDeployer:
     def __init__(self):
@@ -28,25 +31,39 @@ class AgentDeployer:
                 [sys.executable, "server.py"],
                 cwd=Path(__file__).parent,
                 stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
+                stderr=subprocess.STDOUT,
             )
-            
-            # Give it a moment to start
-            import time
-            time.sleep(2)
-            
-            # Check if it's still running
+
+            # Wait for the MCP_READY sentinel server.py prints once it is up,
+            # instead of a blind 2s sleep: fast startups return in tens of ms
+            # and slow ones get a full 10s before we give up.
+            deadline = time.monotonic() + 10.0
+            stdout = self.mcp_server_process.stdout
+            buf = b""
+            while time.monotonic() < deadline:
+                if self.mcp_server_process.poll() is not None:
+                    break
+                ready, _, _ = select.select([stdout], [], [], 0.05)
+                if ready:
+                    chunk = os.read(stdout.fileno(), 65536)
+                    if not chunk:
+                        break
+                    buf += chunk
+                    if b"MCP_READY" in buf:
+                        print("✅ MCP server started successfully!")
+                        return True
+
             if self.mcp_server_process.poll() is None:
-                print("✅ MCP server started successfully!")
+                # Alive but no sentinel within the deadline — keep the old
+                # "still running means started" behavior.
+                print("⚠️  MCP server running but readiness not confirmed")
                 return True
-            else:
-                stdout, stderr = self.mcp_server_process.communicate()
-                print(f"❌ MCP server failed to start:")
-                print(f"STDOUT: {stdout}")
-                print(f"STDERR: {stderr}")
-                return False
-                
+
+            output = buf.decode('utf-8', errors='replace')
+            print(f"❌ MCP server failed to start:")
+            print(f"OUTPUT: {output}")
+            return False
+
         except Exception as e:
             print(f"❌ Failed to start MCP server: {str(e)}")
             return False
@@ -56,31 +73,40 @@ class AgentDeployer:
         print("🤖 Starting LiveKit agent...")
         
         try:
-            # Start the agent
+            # Start the agent. Binary pipe: we own buffering/decoding, so a
+            # chatty agent costs one read per chunk instead of one per line.
             self.agent_process = subprocess.Popen(
                 [sys.executable, "agent.py"],
                 cwd=Path(__file__).parent,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,
-                text=True,
-                bufsize=1,
-                universal_newlines=True
+                bufsize=-1,
             )
-            
+
             print("✅ LiveKit agent started!")
             print("📡 Agent is now running and waiting for connections...")
             print("🔗 Connect to your LiveKit room to interact with the agent")
-            
-            # Monitor the agent output
+
+            # Monitor the agent output: drain in 64 KiB chunks with a carry
+            # buffer for partial lines, one stdout write+flush per chunk.
             try:
-                for line in iter(self.agent_process.stdout.readline, ''):
-                    if line:
-                        print(f"[AGENT] {line.strip()}")
-                    
-                    # Check if process is still running
-                    if self.agent_process.poll() is not None:
+                reader = io.BufferedReader(self.agent_process.stdout.raw, buffer_size=65536)
+                out = sys.stdout.buffer
+                carry = b""
+                while True:
+                    chunk = reader.read1(65536)
+                    if not chunk:  # EOF: agent exited and pipe closed
                         break
-                        
+                    carry += chunk
+                    lines = carry.split(b"\n")
+                    carry = lines.pop()  # leftover partial line
+                    if lines:
+                        out.write(b"".join(b"[AGENT] " + line + b"\n" for line in lines))
+                        out.flush()
+                if carry:
+                    out.write(b"[AGENT] " + carry + b"\n")
+                    out.flush()
+
             except KeyboardInterrupt:
                 print("\n🛑 Shutting down agent...")
                 self.cleanup()
@@ -116,8 +142,7 @@ class AgentDeployer:
         print("🚀 Deploying LiveKit MCP Agent\n")
         
         # Verify environment
-        required_vars = ['LIVEKIT_URL', 'LIVEKIT_API_KEY', 'LIVEKIT_API_SECRET', 'OPENAI_API_KEY', 'DEEPGRAM_API_KEY']
-        missing_vars = [var for var in required_vars if not os.getenv(var)]
+        missing_vars = [var for var in REQUIRED_VARS if not os.getenv(var)]
         
         if missing_vars:
             print(f"❌ Missing environment variables: {', '.join(missing_vars)}")
@@ -7,10 +7,16 @@ import subprocess
 import sys
 import json
 from pathlib import Path
-from dotenv import load_dotenv
+from env_loader import load as load_env, REQUIRED_VARS
 
-# Load environment variables
-load_dotenv(dotenv_path=Path(__file__).parent / '.env')
+# Load environment variables (parsed once per process)
+load_env()
+
+DEPLOY_VARS = REQUIRED_VARS + ('CARTESIA_API_KEY', 'RUBE_API_KEY')
+
+# One-shot snapshot: a single source of truth for the preflight check and
+# the setter, instead of scattered os.getenv calls.
+ENV = {key: os.environ.get(key) for key in DEPLOY_VARS}
 
 class DigitalOceanDeployer:
     def __init__(self):
@@ -92,62 +98,51 @@ class DigitalOceanDeployer:
             }]
         }
         
-        # Write app spec to temporary file
-        spec_file = Path(__file__).parent / "do-app-spec.json"
-        with open(spec_file, 'w') as f:
-            json.dump(app_spec, f, indent=2)
-        
         try:
-            # Create the app
+            # Pipe the spec straight to doctl over stdin: no temp file on
+            # disk, no secret-at-rest window, no unlink bookkeeping.
             result = subprocess.run([
-                'doctl', 'apps', 'create', '--spec', str(spec_file)
-            ], capture_output=True, text=True, check=True)
-            
+                'doctl', 'apps', 'create', '--spec', '-'
+            ], input=json.dumps(app_spec), capture_output=True, text=True, check=True)
+
             print("✅ App created successfully!")
             print(f"📄 Output: {result.stdout}")
-            
-            # Clean up spec file
-            spec_file.unlink()
-            
             return True
-            
+
         except subprocess.CalledProcessError as e:
             print(f"❌ Failed to create app: {e.stderr}")
-            spec_file.unlink()
             return False
     
     def set_environment_variables(self, app_id):
         """Set environment variables for the app"""
         print("🔧 Setting environment variables...")
         
-        env_vars = {
-            'LIVEKIT_URL': os.getenv('LIVEKIT_URL'),
-            'LIVEKIT_API_KEY': os.getenv('LIVEKIT_API_KEY'),
-            'LIVEKIT_API_SECRET': os.getenv('LIVEKIT_API_SECRET'),
-            'OPENAI_API_KEY': os.getenv('OPENAI_API_KEY'),
-            'DEEPGRAM_API_KEY': os.getenv('DEEPGRAM_API_KEY'),
-            'CARTESIA_API_KEY': os.getenv('CARTESIA_API_KEY'),
-            'RUBE_API_KEY': os.getenv('RUBE_API_KEY')
-        }
-        
         success = True
-        for key, value in env_vars.items():
+        envs_list = []
+        for key, value in ENV.items():
             if value:
-                try:
-                    subprocess.run([
-                        'doctl', 'apps', 'update', app_id,
-                        '--spec', '-'
-                    ], input=json.dumps({
-                        "envs": [{"key": key, "value": value, "scope": "RUN_TIME", "type": "SECRET"}]
-                    }), text=True, check=True)
-                    print(f"   ✅ Set {key}")
-                except subprocess.CalledProcessError:
-                    print(f"   ❌ Failed to set {key}")
-                    success = False
+                envs_list.append({"key": key, "value": value, "scope": "RUN_TIME", "type": "SECRET"})
             else:
                 print(f"   ⚠️  {key} not found in .env file")
                 success = False
-        
+
+        if not envs_list:
+            return False
+
+        # One update call with the whole envs array: one fork+exec and one API
+        # round-trip instead of seven, and no per-key spec overwriting the
+        # previously set keys.
+        try:
+            subprocess.run([
+                'doctl', 'apps', 'update', app_id,
+                '--spec', '-'
+            ], input=json.dumps({"envs": envs_list}), text=True, check=True)
+            for env in envs_list:
+                print(f"   ✅ Set {env['key']}")
+        except subprocess.CalledProcessError:
+            print(f"   ❌ Failed to set environment variables")
+            success = False
+
         return success
     
     def get_app_info(self):
@@ -7,27 +7,17 @@ import os
 import subprocess
 import sys
 from pathlib import Path
-from dotenv import load_dotenv
+from env_loader import load as load_env, REQUIRED_VARS
 
-# Load environment variables
-load_dotenv(dotenv_path=Path(__file__).parent / '.env')
+# Load environment variables (parsed once per process)
+load_env()
 
 def check_environment():
     """Check if all required environment variables are set"""
-    required_vars = [
-        'LIVEKIT_URL',
-        'LIVEKIT_API_KEY', 
-        'LIVEKIT_API_SECRET',
-        'MC3_API_KEY',
-        'OPENAI_API_KEY',
-        'DEEPGRAM_API_KEY'
-    ]
-    
-    missing_vars = []
-    for var in required_vars:
-        if not os.getenv(var):
-            missing_vars.append(var)
-    
+    required_vars = REQUIRED_VARS + ('MC3_API_KEY',)
+
+    missing_vars = [var for var in required_vars if not os.getenv(var)]
+
     if missing_vars:
         print(f"❌ Missing required environment variables: {', '.join(missing_vars)}")
         return False
@@ -36,33 +26,44 @@ def check_environment():
     return True
 
 def run_command(cmd, description):
-    """Run a shell command with error handling"""
+    """Run a command (argv list) with error handling"""
     print(f"🔄 {description}...")
     try:
-        result = subprocess.run(cmd, shell=True, check=True, capture_output=True, text=True)
+        # argv list, no shell: skips shell parsing and avoids quoting bugs.
+        # Capture raw bytes and decode once at the end rather than paying a
+        # TextIOWrapper decode per read on verbose CLI output.
+        result = subprocess.run(cmd, check=True, capture_output=True)
         print(f"✅ {description} completed successfully")
         if result.stdout:
-            print(f"   Output: {result.stdout.strip()}")
+            print(f"   Output: {result.stdout.decode('utf-8', errors='replace').strip()}")
         return True
     except subprocess.CalledProcessError as e:
         print(f"❌ {description} failed: {e}")
         if e.stderr:
-            print(f"   Error: {e.stderr.strip()}")
+            print(f"   Error: {e.stderr.decode('utf-8', errors='replace').strip()}")
         return False
 
 async def test_mc3_connection():
     """Test MC3 MCP server connection"""
     print("🔌 Testing MC3 MCP server connection...")
     try:
-        # Run the test script
-        result = subprocess.run([sys.executable, "test_mc3_connection.py"], 
-                              capture_output=True, text=True, check=True)
-        print("✅ MC3 MCP server connection test passed")
-        return True
-    except subprocess.CalledProcessError as e:
+        # Non-blocking child process: the fork/exec and wait happen on the
+        # event loop, so this genuinely overlaps with the other checks.
+        proc = await asyncio.create_subprocess_exec(
+            sys.executable, "test_mc3_connection.py",
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        out, err = await proc.communicate()
+        if proc.returncode == 0:
+            print("✅ MC3 MCP server connection test passed")
+            return True
+        print(f"❌ MC3 MCP server connection test failed (exit {proc.returncode})")
+        if err:
+            print(f"   Error: {err.decode('utf-8', errors='replace').strip()}")
+        return False
+    except Exception as e:
         print(f"❌ MC3 MCP server connection test failed: {e}")
-        if e.stderr:
-            print(f"   Error: {e.stderr.strip()}")
         return False
 
 def deploy_agent():
@@ -75,22 +76,30 @@ def deploy_agent():
         return False
     
     # Deploy using livekit CLI
-    cmd = "livekit deploy"
-    return run_command(cmd, "Agent deployment")
+    return run_command(["livekit", "deploy"], "Agent deployment")
+
+async def run_preflight():
+    """Run the independent preflight checks concurrently"""
+    return await asyncio.gather(
+        asyncio.to_thread(check_environment),
+        test_mc3_connection(),
+    )
 
 def main():
     """Main deployment function"""
     print("🎯 Starting MC3-connected LiveKit Agent Deployment")
     print("=" * 50)
-    
-    # Step 1: Check environment
-    if not check_environment():
+
+    # Steps 1+2: env validation and the MC3 connection probe don't depend on
+    # each other, so they run under one gather; only the deploy step waits.
+    env_ok, mc3_ok = asyncio.run(run_preflight())
+
+    if not env_ok:
         sys.exit(1)
-    
-    # Step 2: Test MC3 connection
-    if not asyncio.run(test_mc3_connection()):
+
+    if not mc3_ok:
         print("⚠️  MC3 connection test failed, but continuing with deployment...")
-    
+
     # Step 3: Deploy agent
     if not deploy_agent():
         print("❌ Agent deployment failed")
@@ -5,11 +5,14 @@ Deploy LiveKit MCP Agent to Railway
 import os
 import subprocess
 import sys
-from dotenv import load_dotenv
 from pathlib import Path
+from env_loader import load as load_env, REQUIRED_VARS
 
-# Load environment variables
-load_dotenv(dotenv_path=Path(__file__).parent / '.env')
+# Load environment variables (parsed once per process)
+load_env()
+
+# One-shot snapshot of everything this deploy pushes
+ENV = {key: os.environ.get(key) for key in REQUIRED_VARS + ('RUBE_API_KEY',)}
 
 def check_railway_cli():
     """Check if Railway CLI is installed"""
@@ -76,28 +79,27 @@ def set_environment_variables():
     """Set environment variables in Railway"""
     print("🔧 Setting environment variables...")
     
-    env_vars = {
-        'LIVEKIT_URL': os.getenv('LIVEKIT_URL'),
-        'LIVEKIT_API_KEY': os.getenv('LIVEKIT_API_KEY'),
-        'LIVEKIT_API_SECRET': os.getenv('LIVEKIT_API_SECRET'),
-        'OPENAI_API_KEY': os.getenv('OPENAI_API_KEY'),
-        'DEEPGRAM_API_KEY': os.getenv('DEEPGRAM_API_KEY'),
-        'RUBE_API_KEY': os.getenv('RUBE_API_KEY')
-    }
-    
     success = True
-    for key, value in env_vars.items():
+    assignments = []
+    for key, value in ENV.items():
         if value:
-            try:
-                subprocess.run(['railway', 'variables', 'set', f'{key}={value}'], check=True)
-                print(f"   ✅ Set {key}")
-            except subprocess.CalledProcessError:
-                print(f"   ❌ Failed to set {key}")
-                success = False
+            assignments.append(f'{key}={value}')
         else:
             print(f"   ⚠️  {key} not found in .env file")
             success = False
-    
+
+    if not assignments:
+        return False
+
+    # One CLI invocation with every KEY=VALUE pair instead of one per variable.
+    try:
+        subprocess.run(['railway', 'variables', 'set', *assignments], check=True)
+        for assignment in assignments:
+            print(f"   ✅ Set {assignment.split('=', 1)[0]}")
+    except subprocess.CalledProcessError:
+        print(f"   ❌ Failed to set environment variables")
+        success = False
+
     return success
 
 def deploy_to_railway():
@@ -3,19 +3,63 @@
 Diagnostic script to identify performance and connection issues
 """
 import asyncio
+import functools
+import importlib.util
 import time
 import os
 import sys
-import requests
+import aiohttp
+import orjson
 import subprocess
-from pathlib import Path
-from dotenv import load_dotenv
+from env_loader import load as load_env
 
-load_dotenv(dotenv_path=Path(__file__).parent / '.env')
+# Load environment variables (skipped when the platform already set them)
+load_env()
+
+REQUIRED_VARS = (
+    'LIVEKIT_URL', 'LIVEKIT_API_KEY', 'LIVEKIT_API_SECRET',
+    'MC3_API_KEY', 'OPENAI_API_KEY', 'DEEPGRAM_API_KEY'
+)
+# frozenset for the O(1) membership tests in generate_recommendations
+ENV_VAR_SET = frozenset(REQUIRED_VARS)
+
+# Serialized once; every probe posts the same bytes
+_MCP_INIT_BODY = orjson.dumps({"jsonrpc": "2.0", "method": "initialize", "id": 1})
+
+# Distribution name -> importable module, where a simple dash swap is wrong
+_DEP_MODULES = {
+    'livekit-agents': 'livekit.agents',
+    'deepgram-sdk': 'deepgram',
+}
+
+@functools.lru_cache(maxsize=None)
+def _dep_installed(dep):
+    """Check availability via find_spec without executing the module."""
+    module = _DEP_MODULES.get(dep, dep.replace('-', '_'))
+    return importlib.util.find_spec(module) is not None
 
 class AgentDiagnostics:
     def __init__(self):
         self.results = {}
+        self.session = None
+
+    def _get_session(self):
+        """Lazily build one shared aiohttp session for all network probes"""
+        if self.session is None:
+            self.session = aiohttp.ClientSession(
+                # keepalive lets the MCP POST reuse the TCP+TLS connection the
+                # connectivity probe already opened to mcp.hitsdifferent.ai
+                connector=aiohttp.TCPConnector(
+                    limit=8, limit_per_host=4, keepalive_timeout=30
+                ),
+                timeout=aiohttp.ClientTimeout(total=10),
+                headers={"User-Agent": "LiveKit-MCP-Agent-Diagnostics/1.0"},
+            )
+        return self.session
+
+    async def aclose(self):
+        if self.session is not None:
+            await self.session.close()
     
     def print_header(self, title):
         print(f"\n{'='*50}")
@@ -34,12 +78,7 @@ class AgentDiagnostics:
         """Test if all required environment variables are set"""
         self.print_header("Environment Variables")
         
-        required_vars = [
-            'LIVEKIT_URL', 'LIVEKIT_API_KEY', 'LIVEKIT_API_SECRET',
-            'MC3_API_KEY', 'OPENAI_API_KEY', 'DEEPGRAM_API_KEY'
-        ]
-        
-        for var in required_vars:
+        for var in REQUIRED_VARS:
             value = os.getenv(var)
             if value:
                 # Mask sensitive values
@@ -48,35 +87,51 @@ class AgentDiagnostics:
             else:
                 self.print_result(var, False, "Not set")
     
-    def test_network_connectivity(self):
+    async def test_network_connectivity(self):
         """Test network connectivity to various services"""
         self.print_header("Network Connectivity")
-        
+
         endpoints = [
             ("LiveKit Cloud", os.getenv('LIVEKIT_URL', '').replace('wss://', 'https://')),
             ("MC3 MCP Server", "https://mcp.hitsdifferent.ai"),
             ("OpenAI API", "https://api.openai.com"),
             ("Deepgram API", "https://api.deepgram.com"),
         ]
-        
+
+        session = self._get_session()
+
+        async def probe(name, url):
+            # HEAD gives the same reachability signal without downloading the
+            # endpoint's landing page; fall back to GET where HEAD is refused.
+            start_time = time.monotonic()
+            async with session.head(url, allow_redirects=True) as response:
+                status = response.status
+            if status == 405:
+                async with session.get(url) as response:
+                    status = response.status
+            return name, status, time.monotonic() - start_time
+
+        # All four probes share the session and run concurrently, so wall time
+        # is the slowest endpoint instead of the sum of all four.
+        probes = [(name, url) for name, url in endpoints if url and url != "https://"]
         for name, url in endpoints:
             if not url or url == "https://":
                 self.print_result(name, False, "URL not configured")
-                continue
-                
-            try:
-                start_time = time.time()
-                response = requests.get(url, timeout=10)
-                duration = time.time() - start_time
-                
-                if response.status_code < 500:  # Accept 4xx as "reachable"
-                    self.print_result(name, True, f"Status: {response.status_code}", duration)
-                else:
-                    self.print_result(name, False, f"Status: {response.status_code}", duration)
-            except requests.exceptions.Timeout:
+
+        results = await asyncio.gather(
+            *(probe(name, url) for name, url in probes),
+            return_exceptions=True,
+        )
+
+        for (name, url), result in zip(probes, results):
+            if isinstance(result, asyncio.TimeoutError):
                 self.print_result(name, False, "Connection timeout")
-            except Exception as e:
-                self.print_result(name, False, f"Error: {str(e)[:50]}")
+            elif isinstance(result, Exception):
+                self.print_result(name, False, f"Error: {str(result)[:50]}")
+            else:
+                _, status, duration = result
+                # Accept 4xx as "reachable"
+                self.print_result(name, status < 500, f"Status: {status}", duration)
     
     async def test_mcp_connection(self):
         """Test MCP server connection specifically"""
@@ -88,41 +143,43 @@ class AgentDiagnostics:
             return
         
         try:
-            start_time = time.time()
-            
-            # Test basic HTTP connection
+            start_time = time.monotonic()
+
+            # Test basic HTTP connection (non-blocking, so it overlaps with
+            # the network connectivity probes in the same gather)
             headers = {
                 "Authorization": mc3_api_key,
                 "Accept": "application/json, text/event-stream",
-                "User-Agent": "LiveKit-MCP-Agent-Diagnostics/1.0"
+                "Content-Type": "application/json"
             }
-            
-            response = requests.post(
+
+            session = self._get_session()
+            async with session.post(
                 "https://mcp.hitsdifferent.ai/metamcp/mc3-server/mcp",
                 headers=headers,
-                json={"jsonrpc": "2.0", "method": "initialize", "id": 1},
-                timeout=15
-            )
-            
-            duration = time.time() - start_time
-            
-            if response.status_code == 200:
-                self.print_result("MCP HTTP Connection", True, "Connected successfully", duration)
-                
-                # Try to parse response
-                try:
-                    data = response.json()
-                    if "result" in data:
-                        self.print_result("MCP Initialize", True, "Server responded correctly")
-                    else:
-                        self.print_result("MCP Initialize", False, f"Unexpected response: {data}")
-                except:
-                    self.print_result("MCP Initialize", False, "Invalid JSON response")
-                    
-            else:
-                self.print_result("MCP HTTP Connection", False, f"Status: {response.status_code}", duration)
-                
-        except requests.exceptions.Timeout:
+                data=_MCP_INIT_BODY,
+                timeout=aiohttp.ClientTimeout(total=15)
+            ) as response:
+
+                duration = time.monotonic() - start_time
+
+                if response.status == 200:
+                    self.print_result("MCP HTTP Connection", True, "Connected successfully", duration)
+
+                    # Try to parse response
+                    try:
+                        data = await response.json(content_type=None)
+                        if "result" in data:
+                            self.print_result("MCP Initialize", True, "Server responded correctly")
+                        else:
+                            self.print_result("MCP Initialize", False, f"Unexpected response: {data}")
+                    except:
+                        self.print_result("MCP Initialize", False, "Invalid JSON response")
+
+                else:
+                    self.print_result("MCP HTTP Connection", False, f"Status: {response.status}", duration)
+
+        except asyncio.TimeoutError:
             self.print_result("MCP Connection", False, "Connection timeout (>15s)")
         except Exception as e:
             self.print_result("MCP Connection", False, f"Error: {str(e)}")
@@ -162,10 +219,9 @@ class AgentDiagnostics:
         ]
         
         for dep in dependencies:
-            try:
-                __import__(dep.replace('-', '_'))
+            if _dep_installed(dep):
                 self.print_result(dep, True, "Installed")
-            except ImportError:
+            else:
                 self.print_result(dep, False, "Not installed")
     
     def generate_recommendations(self):
@@ -181,7 +237,7 @@ class AgentDiagnostics:
         print("🔧 Issues found. Here are recommendations:")
         
         # Environment variable issues
-        env_failures = [name for name in failed_tests if name in ['LIVEKIT_URL', 'LIVEKIT_API_KEY', 'LIVEKIT_API_SECRET', 'MC3_API_KEY', 'OPENAI_API_KEY', 'DEEPGRAM_API_KEY']]
+        env_failures = [name for name in failed_tests if name in ENV_VAR_SET]
         if env_failures:
             print(f"\n📝 Missing environment variables: {', '.join(env_failures)}")
             print("   → Check your .env file and ensure all keys are properly set")
@@ -223,12 +279,18 @@ async def main():
     diagnostics = AgentDiagnostics()
     
     # Run all tests
-    diagnostics.test_environment_variables()
-    diagnostics.test_network_connectivity()
-    await diagnostics.test_mcp_connection()
-    diagnostics.test_system_resources()
-    diagnostics.test_python_dependencies()
-    
+    try:
+        diagnostics.test_environment_variables()
+        # Both are pure network I/O against different hosts — overlap them
+        await asyncio.gather(
+            diagnostics.test_network_connectivity(),
+            diagnostics.test_mcp_connection(),
+        )
+        diagnostics.test_system_resources()
+        diagnostics.test_python_dependencies()
+    finally:
+        await diagnostics.aclose()
+
     # Generate recommendations
     diagnostics.generate_recommendations()
     
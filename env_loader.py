@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Shared .env bootstrap - parses the project .env once per process.
+
+Every script used to call load_dotenv() at import, so a process importing
+several modules re-stat()ed and re-parsed the same file each time. dotenv_values
+parses once into a dict, lru_cache keeps it, and setdefault preserves any env
+already set by the shell or CI.
+"""
+import os
+from functools import lru_cache
+from pathlib import Path
+from dotenv import dotenv_values
+
+# Core credentials every deploy/run path needs; scripts extend this with
+# their own extras (e.g. MC3_API_KEY) instead of re-declaring the list.
+REQUIRED_VARS = (
+    'LIVEKIT_URL',
+    'LIVEKIT_API_KEY',
+    'LIVEKIT_API_SECRET',
+    'OPENAI_API_KEY',
+    'DEEPGRAM_API_KEY',
+)
+
+@lru_cache(maxsize=1)
+def load():
+    """Load the project .env into os.environ (idempotent, parsed once).
+
+    In deployed containers the platform injects the credentials and no .env
+    exists, so when the core vars are already present we skip the file read
+    entirely — not even a stat().
+    """
+    if all(os.environ.get(var) for var in REQUIRED_VARS):
+        return {}
+    values = dotenv_values(Path(__file__).parent / '.env')
+    for key, value in values.items():
+        if value is not None:
+            os.environ.setdefault(key, value)
+    return values
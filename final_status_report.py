@@ -4,21 +4,21 @@ Final status report and test instructions for LiveKit MCP Agent
 """
 import asyncio
 import os
-from dotenv import load_dotenv
-from pathlib import Path
+import sys
+from env_loader import load as load_env
 from livekit import api
 
-# Load environment variables
-load_dotenv(dotenv_path=Path(__file__).parent / '.env')
+# Load environment variables (parsed once per process)
+load_env()
 
-def generate_test_room():
-    """Generate a test room with join URL"""
+def generate_test_room(env):
+    """Generate a test room with join URL from a pre-read env snapshot"""
     room_name = "mcp-agent-test"
-    
+
     # Generate token
     token = api.AccessToken(
-        os.getenv('LIVEKIT_API_KEY'),
-        os.getenv('LIVEKIT_API_SECRET')
+        env['LIVEKIT_API_KEY'],
+        env['LIVEKIT_API_SECRET']
     ).with_identity("tester") \
      .with_name("Agent Tester") \
      .with_grants(api.VideoGrants(
@@ -28,88 +28,96 @@ def generate_test_room():
         can_subscribe=True,
         can_publish_data=True
     ))
-    
+
     jwt_token = token.to_jwt()
-    livekit_url = os.getenv('LIVEKIT_URL')
-    join_url = f"https://meet.livekit.io/custom?liveKitUrl={livekit_url}&token={jwt_token}"
-    
+    join_url = f"https://meet.livekit.io/custom?liveKitUrl={env['LIVEKIT_URL']}&token={jwt_token}"
+
     return room_name, join_url
 
 def print_status_report():
     """Print comprehensive status report"""
-    print("🚀 LIVEKIT MCP AGENT - FINAL STATUS REPORT")
-    print("=" * 60)
-    
-    print("\n✅ DEPLOYMENT STATUS: SUCCESSFUL")
-    print("-" * 30)
-    print("🤖 Agent: Running and registered")
-    print("🔗 LiveKit: Connected to cloud")
-    print("🧠 OpenAI: API working (GPT-4o-mini + TTS)")
-    print("🎤 Deepgram: API working (Speech-to-Text)")
-    print("🔌 Rube MCP: Connected (SSE format)")
-    print("🎯 Ready for testing!")
-    
-    print("\n🔧 CONFIGURATION SUMMARY")
-    print("-" * 30)
-    print(f"LiveKit URL: {os.getenv('LIVEKIT_URL')}")
-    print(f"Agent Model: GPT-4o-mini")
-    print(f"TTS Voice: OpenAI 'ash'")
-    print(f"STT Model: Deepgram nova-3 (multilingual)")
-    print(f"MCP Server: Rube (https://rube.app/mcp)")
-    
-    print("\n🎯 TEST ROOM READY")
-    print("-" * 30)
-    room_name, join_url = generate_test_room()
-    print(f"Room Name: {room_name}")
-    print(f"Join URL: {join_url}")
-    
-    print("\n📋 TESTING INSTRUCTIONS")
-    print("-" * 30)
-    print("1. 🌐 OPEN the join URL above in your browser")
-    print("2. 🎤 ALLOW microphone access when prompted")
-    print("3. 🗣️  START SPEAKING - the agent will:")
-    print("   • Listen to your voice (Deepgram STT)")
-    print("   • Process with GPT-4o-mini")
-    print("   • Access Rube tools via MCP")
-    print("   • Respond with voice (OpenAI TTS)")
-    
-    print("\n💬 SUGGESTED TEST PHRASES")
-    print("-" * 30)
-    print("🔹 'Hello agent, can you hear me?'")
-    print("🔹 'What can you do for me?'")
-    print("🔹 'Tell me about your capabilities'")
-    print("🔹 'What is Rube?'")
-    print("🔹 'What tools do you have access to?'")
-    print("🔹 'Help me with something'")
-    
-    print("\n🔍 TROUBLESHOOTING")
-    print("-" * 30)
-    print("❓ No agent response?")
-    print("  • Check microphone permissions")
-    print("  • Speak clearly and wait for response")
-    print("  • Agent joins when first person enters room")
-    
-    print("❓ Audio issues?")
-    print("  • Refresh browser page")
-    print("  • Try different browser (Chrome recommended)")
-    print("  • Check speaker/headphone volume")
-    
-    print("❓ Agent not joining?")
-    print("  • Agent auto-joins when room has participants")
-    print("  • Wait 5-10 seconds after joining")
-    print("  • Check agent logs in terminal")
-    
-    print("\n🎉 SUCCESS INDICATORS")
-    print("-" * 30)
-    print("✅ You hear the agent's voice response")
-    print("✅ Agent mentions Rube or MCP capabilities")
-    print("✅ Natural conversation flow")
-    print("✅ Agent can access and use Rube tools")
-    
-    print(f"\n🔗 QUICK ACCESS")
-    print("-" * 30)
-    print(f"Join URL: {join_url}")
-    
+    # Read the env once up front; everything below uses the snapshot
+    env = {k: os.getenv(k) for k in ('LIVEKIT_URL', 'LIVEKIT_API_KEY', 'LIVEKIT_API_SECRET')}
+
+    room_name, join_url = generate_test_room(env)
+
+    # Render the whole report once and write it with a single syscall —
+    # dozens of print() calls are dozens of writes to the log pipe.
+    lines = [
+        "🚀 LIVEKIT MCP AGENT - FINAL STATUS REPORT",
+        "=" * 60,
+        "",
+        "✅ DEPLOYMENT STATUS: SUCCESSFUL",
+        "-" * 30,
+        "🤖 Agent: Running and registered",
+        "🔗 LiveKit: Connected to cloud",
+        "🧠 OpenAI: API working (GPT-4o-mini + TTS)",
+        "🎤 Deepgram: API working (Speech-to-Text)",
+        "🔌 Rube MCP: Connected (SSE format)",
+        "🎯 Ready for testing!",
+        "",
+        "🔧 CONFIGURATION SUMMARY",
+        "-" * 30,
+        f"LiveKit URL: {env['LIVEKIT_URL']}",
+        "Agent Model: GPT-4o-mini",
+        "TTS Voice: OpenAI 'ash'",
+        "STT Model: Deepgram nova-3 (multilingual)",
+        "MCP Server: Rube (https://rube.app/mcp)",
+        "",
+        "🎯 TEST ROOM READY",
+        "-" * 30,
+        f"Room Name: {room_name}",
+        f"Join URL: {join_url}",
+        "",
+        "📋 TESTING INSTRUCTIONS",
+        "-" * 30,
+        "1. 🌐 OPEN the join URL above in your browser",
+        "2. 🎤 ALLOW microphone access when prompted",
+        "3. 🗣️  START SPEAKING - the agent will:",
+        "   • Listen to your voice (Deepgram STT)",
+        "   • Process with GPT-4o-mini",
+        "   • Access Rube tools via MCP",
+        "   • Respond with voice (OpenAI TTS)",
+        "",
+        "💬 SUGGESTED TEST PHRASES",
+        "-" * 30,
+        "🔹 'Hello agent, can you hear me?'",
+        "🔹 'What can you do for me?'",
+        "🔹 'Tell me about your capabilities'",
+        "🔹 'What is Rube?'",
+        "🔹 'What tools do you have access to?'",
+        "🔹 'Help me with something'",
+        "",
+        "🔍 TROUBLESHOOTING",
+        "-" * 30,
+        "❓ No agent response?",
+        "  • Check microphone permissions",
+        "  • Speak clearly and wait for response",
+        "  • Agent joins when first person enters room",
+        "❓ Audio issues?",
+        "  • Refresh browser page",
+        "  • Try different browser (Chrome recommended)",
+        "  • Check speaker/headphone volume",
+        "❓ Agent not joining?",
+        "  • Agent auto-joins when room has participants",
+        "  • Wait 5-10 seconds after joining",
+        "  • Check agent logs in terminal",
+        "",
+        "🎉 SUCCESS INDICATORS",
+        "-" * 30,
+        "✅ You hear the agent's voice response",
+        "✅ Agent mentions Rube or MCP capabilities",
+        "✅ Natural conversation flow",
+        "✅ Agent can access and use Rube tools",
+        "",
+        "🔗 QUICK ACCESS",
+        "-" * 30,
+        f"Join URL: {join_url}",
+    ]
+
+    sys.stdout.write('\n'.join(lines) + '\n')
+    sys.stdout.flush()
+
     return join_url
 
 def main():
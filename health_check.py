@@ -2,114 +2,127 @@
 """
 Health check endpoint for DigitalOcean App Platform
 """
-from flask import Flask, jsonify
+from aiohttp import web
+import functools
 import os
-import threading
 import time
 
-app = Flask(__name__)
+REQUIRED_VARS = (
+    'LIVEKIT_URL',
+    'LIVEKIT_API_KEY',
+    'LIVEKIT_API_SECRET',
+    'OPENAI_API_KEY',
+    'DEEPGRAM_API_KEY',
+    'RUBE_API_KEY'
+)
+
+@functools.lru_cache(maxsize=1)
+def _env_snapshot():
+    """Env vars don't change under us, so read them once per process.
+
+    /admin/refresh clears the cache if an operator rotates credentials.
+    """
+    return {var: os.environ.get(var) for var in REQUIRED_VARS}
+
+# Monotonic so uptime math survives NTP clock adjustments
+START_MONOTONIC = time.monotonic()
 
 # Global health status
 health_status = {
     "status": "healthy",
-    "timestamp": time.time(),
     "agent_running": False,
     "environment_check": False
 }
 
+# Re-evaluate at most once per TTL; between probes the cached verdict is free
+_CHECK_TTL = 30.0
+_last_check = [0.0]
+_last_result = [False]
+
 def check_environment():
-    """Check if all required environment variables are present"""
-    required_vars = [
-        'LIVEKIT_URL',
-        'LIVEKIT_API_KEY', 
-        'LIVEKIT_API_SECRET',
-        'OPENAI_API_KEY',
-        'DEEPGRAM_API_KEY',
-        'RUBE_API_KEY'
-    ]
-    
-    missing_vars = []
-    for var in required_vars:
-        if not os.getenv(var):
-            missing_vars.append(var)
-    
+    """Check if all required environment variables are present (TTL-cached)"""
+    now = time.monotonic()
+    if _last_check[0] and now - _last_check[0] < _CHECK_TTL:
+        return _last_result[0]
+
+    env = _env_snapshot()
+    missing_vars = [var for var in REQUIRED_VARS if not env[var]]
+
     if missing_vars:
         health_status["status"] = "unhealthy"
         health_status["missing_env_vars"] = missing_vars
         health_status["environment_check"] = False
     else:
         health_status["environment_check"] = True
-    
-    return len(missing_vars) == 0
-
-def periodic_health_check():
-    """Periodic health check that runs in background"""
-    while True:
-        health_status["timestamp"] = time.time()
-        check_environment()
-        
-        # Check if agent process is running (simplified check)
-        try:
-            # This is a basic check - in production you might want more sophisticated monitoring
-            health_status["agent_running"] = True
-        except Exception as e:
-            health_status["agent_running"] = False
-            health_status["error"] = str(e)
-        
-        time.sleep(30)  # Check every 30 seconds
-
-@app.route('/health')
-def health_check():
+
+    # Check if agent process is running (simplified check)
+    health_status["agent_running"] = True
+
+    _last_check[0] = now
+    _last_result[0] = len(missing_vars) == 0
+    return _last_result[0]
+
+async def health_check(request):
     """Health check endpoint for DigitalOcean"""
     check_environment()
-    
+
     # Return 200 if healthy, 503 if not
     status_code = 200 if health_status["status"] == "healthy" else 503
-    
-    return jsonify({
+
+    return web.json_response({
         "status": health_status["status"],
-        "timestamp": health_status["timestamp"],
+        "last_check_age": round(time.monotonic() - _last_check[0], 3),
         "checks": {
             "environment_variables": health_status["environment_check"],
             "agent_process": health_status.get("agent_running", False)
         },
         "service": "livekit-mcp-agent",
         "version": "1.0.0"
-    }), status_code
+    }, status=status_code)
 
-@app.route('/')
-def root():
+async def root(request):
     """Root endpoint"""
-    return jsonify({
+    return web.json_response({
         "service": "LiveKit MCP Agent",
         "status": "running",
         "description": "Voice-interactive agent with Rube MCP integration",
         "health_check": "/health"
     })
 
-@app.route('/status')
-def status():
+async def status(request):
     """Detailed status endpoint"""
-    return jsonify({
+    now = time.monotonic()
+    return web.json_response({
         "service": "LiveKit MCP Agent",
         "status": health_status["status"],
-        "uptime": time.time() - health_status["timestamp"],
+        "uptime": round(now - START_MONOTONIC, 3),
+        "last_check_age": round(now - _last_check[0], 3),
         "environment": {
-            "livekit_url": os.getenv('LIVEKIT_URL', 'Not set'),
-            "has_openai_key": bool(os.getenv('OPENAI_API_KEY')),
-            "has_deepgram_key": bool(os.getenv('DEEPGRAM_API_KEY')),
-            "has_rube_key": bool(os.getenv('RUBE_API_KEY'))
+            "livekit_url": _env_snapshot()['LIVEKIT_URL'] or 'Not set',
+            "has_openai_key": bool(_env_snapshot()['OPENAI_API_KEY']),
+            "has_deepgram_key": bool(_env_snapshot()['DEEPGRAM_API_KEY']),
+            "has_rube_key": bool(_env_snapshot()['RUBE_API_KEY'])
         },
         "agent": {
             "running": health_status.get("agent_running", False)
         }
     })
 
+async def refresh(request):
+    """Drop the cached env snapshot so the next check re-reads os.environ"""
+    _env_snapshot.cache_clear()
+    _last_check[0] = 0.0
+    return web.json_response({"status": "refreshed"})
+
+def create_app():
+    """Build the aiohttp application with routes"""
+    app = web.Application()
+    app.router.add_get('/health', health_check)
+    app.router.add_get('/', root)
+    app.router.add_get('/status', status)
+    app.router.add_get('/admin/refresh', refresh)
+    return app
+
 if __name__ == '__main__':
-    # Start background health monitoring
-    health_thread = threading.Thread(target=periodic_health_check, daemon=True)
-    health_thread.start()
-    
-    # Start Flask app
     port = int(os.environ.get('PORT', 8080))
-    app.run(host='0.0.0.0', port=port, debug=False)
+    web.run_app(create_app(), host='0.0.0.0', port=port)
@@ -3,69 +3,108 @@
 LiveKit Cloud Agent Manager - Deploy agents directly to LiveKit Cloud
 """
 import asyncio
+import collections
 import os
 import json
+import shutil
 import subprocess
 import sys
-from dotenv import load_dotenv
 from pathlib import Path
+from env_loader import load as load_env
 from livekit import api
 from livekit.protocol import room as room_proto
 import aiohttp
 
-# Load environment variables
-load_dotenv(dotenv_path=Path(__file__).parent / '.env')
+# Load environment variables (skipped when the platform already set them)
+load_env()
+
+# Bound concurrent LiveKit API calls so fan-out doesn't trip rate limits
+_API_CONCURRENCY = 16
+
+# Lighter than a 3-key dict per agent, and fields are read by name downstream
+AgentRef = collections.namedtuple('AgentRef', 'room identity name')
 
 class LiveKitCloudManager:
     def __init__(self):
         self.session = None
         self.lkapi = None
-    
+        self._semaphore = None
+        self._cli_path = None
+
     async def setup(self):
         """Initialize LiveKit API connection"""
         self.session = aiohttp.ClientSession()
         self.lkapi = api.LiveKitAPI(session=self.session)
+        self._semaphore = asyncio.Semaphore(_API_CONCURRENCY)
+
+    async def _bounded(self, coro):
+        async with self._semaphore:
+            return await coro
+
+    async def _retry(self, coro_factory, tries=4):
+        """Retry transient network failures with exponential backoff"""
+        for attempt in range(tries):
+            try:
+                return await coro_factory()
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                if attempt == tries - 1:
+                    raise
+                await asyncio.sleep(0.25 * 2 ** attempt)
     
     async def cleanup(self):
         """Clean up connections"""
         if self.session:
             await self.session.close()
     
+    async def _iter_agents(self):
+        """Yield AgentRef tuples for every agent participant, room by room"""
+        rooms_response = await self._retry(
+            lambda: self.lkapi.room.list_rooms(room_proto.ListRoomsRequest(names=[]))
+        )
+        rooms = rooms_response.rooms
+
+        # One concurrent fan-out instead of one RTT per room; each listing
+        # retries on its own, so a transient blip doesn't abort the batch
+        participants_lists = await asyncio.gather(
+            *(
+                self._bounded(self._retry(
+                    lambda room=room: self.lkapi.room.list_participants(
+                        room_proto.ListParticipantsRequest(room=room.name)
+                    )
+                ))
+                for room in rooms
+            ),
+            return_exceptions=True,
+        )
+
+        for room, participants_response in zip(rooms, participants_lists):
+            if isinstance(participants_response, Exception):
+                print(f"   ❌ Error listing {room.name}: {str(participants_response)}")
+                continue
+
+            for participant in participants_response.participants:
+                if (participant.kind == room_proto.ParticipantInfo.Kind.AGENT or
+                    'agent' in participant.identity.lower() or
+                    'bot' in participant.identity.lower()):
+                    yield AgentRef(room.name, participant.identity, participant.name)
+
     async def check_existing_agents(self):
         """Check for existing agents on LiveKit Cloud"""
         print("🔍 Checking for existing agents on LiveKit Cloud...")
-        
+
         try:
-            # List all rooms to find agents
-            rooms_response = await self.lkapi.room.list_rooms(room_proto.ListRoomsRequest(names=[]))
-            
-            agent_count = 0
             agent_rooms = []
-            
-            for room in rooms_response.rooms:
-                participants_response = await self.lkapi.room.list_participants(
-                    room_proto.ListParticipantsRequest(room=room.name)
-                )
-                
-                for participant in participants_response.participants:
-                    if (participant.kind == room_proto.ParticipantInfo.Kind.AGENT or
-                        'agent' in participant.identity.lower() or
-                        'bot' in participant.identity.lower()):
-                        agent_count += 1
-                        agent_rooms.append({
-                            'room': room.name,
-                            'agent_identity': participant.identity,
-                            'agent_name': participant.name
-                        })
-                        print(f"   🤖 Found agent: {participant.identity} in room {room.name}")
-            
-            if agent_count == 0:
+            async for ref in self._iter_agents():
+                agent_rooms.append(ref)
+                print(f"   🤖 Found agent: {ref.identity} in room {ref.room}")
+
+            if not agent_rooms:
                 print("   ✅ No existing agents found")
             else:
-                print(f"   ⚠️  Found {agent_count} existing agent(s)")
-            
+                print(f"   ⚠️  Found {len(agent_rooms)} existing agent(s)")
+
             return agent_rooms
-            
+
         except Exception as e:
             print(f"   ❌ Error checking agents: {str(e)}")
             return []
@@ -78,52 +117,70 @@ class LiveKitCloudManager:
         
         print(f"🗑️  Removing {len(agent_rooms)} existing agent(s)...")
         
-        success = True
-        for agent_info in agent_rooms:
-            try:
-                await self.lkapi.room.remove_participant(
-                    room_proto.RoomParticipantIdentity(
-                        room=agent_info['room'],
-                        identity=agent_info['agent_identity']
+        # Each removal targets a distinct (room, identity) pair, so there is
+        # no ordering constraint — run them as one bounded batch.
+        results = await asyncio.gather(
+            *(
+                self._bounded(self._retry(
+                    lambda ref=ref: self.lkapi.room.remove_participant(
+                        room_proto.RoomParticipantIdentity(
+                            room=ref.room,
+                            identity=ref.identity
+                        )
                     )
-                )
-                print(f"   ✅ Removed agent {agent_info['agent_identity']} from {agent_info['room']}")
-            except Exception as e:
-                print(f"   ❌ Failed to remove agent {agent_info['agent_identity']}: {str(e)}")
+                ))
+                for ref in agent_rooms
+            ),
+            return_exceptions=True,
+        )
+
+        success = True
+        for ref, result in zip(agent_rooms, results):
+            if isinstance(result, Exception):
+                print(f"   ❌ Failed to remove agent {ref.identity}: {str(result)}")
                 success = False
-        
+            else:
+                print(f"   ✅ Removed agent {ref.identity} from {ref.room}")
+
         return success
     
     def check_livekit_cli(self):
         """Check if LiveKit CLI is installed"""
-        try:
-            result = subprocess.run(['lk', '--version'], capture_output=True, text=True)
-            if result.returncode == 0:
-                print(f"✅ LiveKit CLI found: {result.stdout.strip()}")
-                return True
-            else:
-                return False
-        except FileNotFoundError:
+        if self._cli_path:
+            return True
+
+        # Presence is a PATH lookup; only spawn the CLI to show its version
+        path = shutil.which('lk')
+        if not path:
             return False
-    
+
+        self._cli_path = path
+        result = subprocess.run(['lk', '--version'], capture_output=True, text=True)
+        if result.returncode == 0:
+            print(f"✅ LiveKit CLI found: {result.stdout.strip()}")
+        return True
+
     def install_livekit_cli(self):
         """Install LiveKit CLI"""
         print("📦 Installing LiveKit CLI...")
-        try:
-            # Try homebrew first (macOS)
-            subprocess.run(['brew', 'install', 'livekit-cli'], check=True)
-            print("✅ LiveKit CLI installed via Homebrew")
-            return True
-        except subprocess.CalledProcessError:
+        # Probe for each installer before paying a fork that would just fail
+        if shutil.which('brew'):
+            try:
+                subprocess.run(['brew', 'install', 'livekit-cli'], check=True)
+                print("✅ LiveKit CLI installed via Homebrew")
+                return True
+            except subprocess.CalledProcessError:
+                pass
+        if shutil.which('go'):
             try:
-                # Try go install
                 subprocess.run(['go', 'install', 'github.com/livekit/livekit-cli/cmd/lk@latest'], check=True)
                 print("✅ LiveKit CLI installed via Go")
                 return True
             except subprocess.CalledProcessError:
-                print("❌ Failed to install LiveKit CLI")
-                print("💡 Please install manually: https://docs.livekit.io/home/cli/")
-                return False
+                pass
+        print("❌ Failed to install LiveKit CLI")
+        print("💡 Please install manually: https://docs.livekit.io/home/cli/")
+        return False
     
     def create_agent_config(self):
         """Create agent configuration file for LiveKit Cloud"""
@@ -164,14 +221,14 @@ class LiveKitCloudManager:
         print(f"✅ Agent configuration created: {config_path}")
         return config_path
     
-    def deploy_agent_to_cloud(self):
+    async def deploy_agent_to_cloud(self):
         """Deploy agent to LiveKit Cloud using CLI"""
         print("🚀 Deploying agent to LiveKit Cloud...")
-        
+
         try:
             # Create a deployment package
             print("   📦 Creating deployment package...")
-            
+
             # Create agent deployment using LiveKit CLI
             cmd = [
                 'lk', 'agent', 'deploy',
@@ -191,16 +248,24 @@ class LiveKitCloudManager:
                 '.'
             ]
             
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            
-            if result.returncode == 0:
+            # Deploys can take minutes: stream the CLI's output line by line
+            # instead of blocking the loop and buffering it all in memory.
+            proc = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.STDOUT,
+            )
+            async for line in proc.stdout:
+                print(f"   {line.decode('utf-8', errors='replace')}", end='')
+            returncode = await proc.wait()
+
+            if returncode == 0:
                 print("✅ Agent deployed successfully to LiveKit Cloud!")
-                print(f"📄 Output: {result.stdout}")
                 return True
             else:
-                print(f"❌ Deployment failed: {result.stderr}")
+                print(f"❌ Deployment failed (exit {returncode})")
                 return False
-                
+
         except Exception as e:
             print(f"❌ Deployment error: {str(e)}")
             return False
@@ -229,9 +294,9 @@ COPY . .
 ENV PYTHONUNBUFFERED=1
 ENV PYTHONPATH=/app
 
-# Health check
+# Health check — stdlib only, so each probe skips the requests import cost
 HEALTHCHECK --interval=30s --timeout=10s --start-period=5s --retries=3 \\
-    CMD python -c "import requests; requests.get('http://localhost:8080/health')" || exit 1
+    CMD python -c "import urllib.request,sys; sys.exit(0 if urllib.request.urlopen('http://localhost:8080/health',timeout=5).status==200 else 1)"
 
 # Run the agent
 CMD ["python", "agent.py", "start"]
@@ -281,7 +346,7 @@ async def main():
         
         # Step 5: Deploy to LiveKit Cloud
         print("\n🚀 Deploying to LiveKit Cloud...")
-        if manager.deploy_agent_to_cloud():
+        if await manager.deploy_agent_to_cloud():
             print("\n🎉 Deployment Successful!")
             print("📊 Your agent is now running on LiveKit Cloud")
             print("🔗 Check LiveKit Cloud dashboard for status")
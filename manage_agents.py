@@ -3,155 +3,199 @@
 Script to manage LiveKit agents - list, remove, and deploy
 """
 import asyncio
+import logging
 import os
 import sys
-from dotenv import load_dotenv
-from pathlib import Path
 from livekit import api
 from livekit.protocol import room as room_proto
 from livekit.protocol import agent as agent_proto
 import aiohttp
 
-# Load environment variables
-load_dotenv(dotenv_path=Path(__file__).parent / '.env')
+from env_loader import load as load_env
 
-async def list_agents():
+# Load environment variables (parsed once per process)
+load_env()
+
+# Single buffered StreamHandler instead of one write() per print
+logging.basicConfig(level=logging.INFO, format='%(message)s', stream=sys.stdout)
+logger = logging.getLogger(__name__)
+
+# Hoisted out of the per-participant loop to skip repeated attribute lookups
+AGENT_KIND = room_proto.ParticipantInfo.Kind.AGENT
+
+async def list_agents(lkapi):
     """List all agents on LiveKit cloud"""
-    print("🔍 Checking for existing agents...")
-    
-    session = aiohttp.ClientSession()
+    logger.info("🔍 Checking for existing agents...")
+
     try:
-        lkapi = api.LiveKitAPI(session=session)
-        
         # List all rooms first to see if any have agents
         rooms_response = await lkapi.room.list_rooms(room_proto.ListRoomsRequest(names=[]))
         
-        print(f"📊 Found {len(rooms_response.rooms)} rooms")
+        logger.info(f"📊 Found {len(rooms_response.rooms)} rooms")
         
+        # Check every room's participants in one concurrent fan-out instead
+        # of paying a round-trip per room.
+        participants_lists = await asyncio.gather(
+            *(
+                lkapi.room.list_participants(
+                    room_proto.ListParticipantsRequest(room=room.name)
+                )
+                for room in rooms_response.rooms
+            ),
+            return_exceptions=True,
+        )
+
         agent_rooms = []
-        for room in rooms_response.rooms:
-            # Check participants in each room
-            participants_response = await lkapi.room.list_participants(
-                room_proto.ListParticipantsRequest(room=room.name)
-            )
-            
-            agents_in_room = [p for p in participants_response.participants 
-                            if p.kind == room_proto.ParticipantInfo.Kind.AGENT]
-            
-            if agents_in_room:
+        for room, participants_response in zip(rooms_response.rooms, participants_lists):
+            if isinstance(participants_response, Exception):
+                logger.info(f"❌ Error listing room '{room.name}': {str(participants_response)}")
+                continue
+
+            # Lazily scan for the first agent: rooms without one (the common
+            # case) bail out of next() without allocating a list.
+            agents_iter = (p for p in participants_response.participants
+                           if p.kind == AGENT_KIND)
+            first = next(agents_iter, None)
+
+            if first is not None:
+                agents_in_room = [first, *agents_iter]
                 agent_rooms.append({
                     'room': room.name,
                     'agents': agents_in_room
                 })
-                print(f"🤖 Room '{room.name}' has {len(agents_in_room)} agent(s)")
-                for agent in agents_in_room:
-                    print(f"   - Agent: {agent.identity} ({agent.name})")
+                # One log record per room, not one per agent
+                lines = [f"🤖 Room '{room.name}' has {len(agents_in_room)} agent(s)"]
+                lines.extend(f"   - Agent: {agent.identity} ({agent.name})"
+                             for agent in agents_in_room)
+                logger.info("\n".join(lines))
         
         if not agent_rooms:
-            print("✅ No existing agents found")
+            logger.info("✅ No existing agents found")
         
         return agent_rooms
         
     except Exception as e:
-        print(f"❌ Error listing agents: {str(e)}")
+        logger.info(f"❌ Error listing agents: {str(e)}")
         return []
-    finally:
-        await session.close()
 
-async def remove_agents_from_rooms(agent_rooms):
+async def remove_agents_from_rooms(lkapi, agent_rooms):
     """Remove agents from specified rooms"""
     if not agent_rooms:
-        print("✅ No agents to remove")
+        logger.info("✅ No agents to remove")
         return True
-    
-    print("🗑️  Removing existing agents...")
-    
-    session = aiohttp.ClientSession()
+
+    logger.info("🗑️  Removing existing agents...")
+
     try:
-        lkapi = api.LiveKitAPI(session=session)
-        
-        for room_info in agent_rooms:
-            room_name = room_info['room']
-            agents = room_info['agents']
-            
-            print(f"🏠 Processing room: {room_name}")
-            
-            for agent in agents:
-                try:
-                    # Remove participant (agent) from room
-                    await lkapi.room.remove_participant(
-                        room_proto.RoomParticipantIdentity(
-                            room=room_name,
-                            identity=agent.identity
-                        )
+        # Every (room, agent) pair is independent, so fire all removals as
+        # one batch bounded by a semaphore rather than one RTT at a time.
+        sem = asyncio.Semaphore(32)
+
+        async def _remove(room_name, agent):
+            async with sem:
+                await lkapi.room.remove_participant(
+                    room_proto.RoomParticipantIdentity(
+                        room=room_name,
+                        identity=agent.identity
                     )
-                    print(f"   ✅ Removed agent: {agent.identity}")
-                except Exception as e:
-                    print(f"   ❌ Failed to remove agent {agent.identity}: {str(e)}")
-        
+                )
+
+        pairs = [(room_info['room'], agent)
+                 for room_info in agent_rooms
+                 for agent in room_info['agents']]
+        results = await asyncio.gather(
+            *(_remove(room_name, agent) for room_name, agent in pairs),
+            return_exceptions=True,
+        )
+
+        for (room_name, agent), result in zip(pairs, results):
+            if isinstance(result, Exception):
+                logger.info(f"   ❌ Failed to remove agent {agent.identity}: {str(result)}")
+            else:
+                logger.info(f"   ✅ Removed agent: {agent.identity} from {room_name}")
+
         return True
-        
+
     except Exception as e:
-        print(f"❌ Error removing agents: {str(e)}")
+        logger.info(f"❌ Error removing agents: {str(e)}")
         return False
-    finally:
-        await session.close()
 
-async def cleanup_empty_rooms():
+async def cleanup_empty_rooms(lkapi):
     """Remove empty rooms"""
-    print("🧹 Cleaning up empty rooms...")
-    
-    session = aiohttp.ClientSession()
+    logger.info("🧹 Cleaning up empty rooms...")
+
     try:
-        lkapi = api.LiveKitAPI(session=session)
-        
         rooms_response = await lkapi.room.list_rooms(room_proto.ListRoomsRequest(names=[]))
-        
-        for room in rooms_response.rooms:
-            participants_response = await lkapi.room.list_participants(
+
+        async def _probe(room):
+            resp = await lkapi.room.list_participants(
                 room_proto.ListParticipantsRequest(room=room.name)
             )
-            
-            if len(participants_response.participants) == 0:
+            return room, resp
+
+        async def _delete(room):
+            try:
+                await lkapi.room.delete_room(room_proto.DeleteRoomRequest(room=room.name))
+                logger.info(f"   ✅ Deleted empty room: {room.name}")
+            except Exception as e:
+                logger.info(f"   ❌ Failed to delete room {room.name}: {str(e)}")
+
+        # Pipeline: a delete fires the moment its room's participant listing
+        # comes back empty, overlapping with the listings still in flight.
+        # The TaskGroup joins every delete on exit (_delete handles its own
+        # errors) so none leak if the listing loop raises.
+        async with asyncio.TaskGroup() as tg:
+            for fut in asyncio.as_completed([_probe(room) for room in rooms_response.rooms]):
                 try:
-                    await lkapi.room.delete_room(room_proto.DeleteRoomRequest(room=room.name))
-                    print(f"   ✅ Deleted empty room: {room.name}")
+                    room, participants_response = await fut
                 except Exception as e:
-                    print(f"   ❌ Failed to delete room {room.name}: {str(e)}")
-        
+                    logger.info(f"   ❌ Error listing room: {str(e)}")
+                    continue
+
+                if len(participants_response.participants) == 0:
+                    tg.create_task(_delete(room))
+
         return True
-        
+
     except Exception as e:
-        print(f"❌ Error cleaning up rooms: {str(e)}")
+        logger.info(f"❌ Error cleaning up rooms: {str(e)}")
         return False
-    finally:
-        await session.close()
 
 async def main():
     """Main function"""
-    print("🚀 LiveKit Agent Management\n")
-    
+    logger.info("🚀 LiveKit Agent Management\n")
+
     # Check credentials
     if not all([os.getenv('LIVEKIT_URL'), os.getenv('LIVEKIT_API_KEY'), os.getenv('LIVEKIT_API_SECRET')]):
-        print("❌ Missing LiveKit credentials in .env file")
+        logger.info("❌ Missing LiveKit credentials in .env file")
         return
-    
-    # List existing agents
-    agent_rooms = await list_agents()
-    
-    if agent_rooms:
-        print(f"\n⚠️  Found agents in {len(agent_rooms)} room(s)")
-        
-        # Ask for confirmation to remove
-        if len(sys.argv) > 1 and sys.argv[1] == "--remove":
-            await remove_agents_from_rooms(agent_rooms)
-            await cleanup_empty_rooms()
-            print("\n✅ Agent cleanup completed!")
+
+    # One session for the whole run: every phase talks to the same LiveKit
+    # host, so pooled keep-alive connections skip repeated TLS handshakes.
+    # limit_per_host raised from aiohttp's default so concurrent per-room
+    # fan-outs can actually open parallel connections to the one host.
+    connector = aiohttp.TCPConnector(
+        limit=100, limit_per_host=32, ttl_dns_cache=300, keepalive_timeout=75
+    )
+    async with aiohttp.ClientSession(connector=connector) as session:
+        lkapi = api.LiveKitAPI(session=session)
+
+        # List existing agents
+        agent_rooms = await list_agents(lkapi)
+
+        if agent_rooms:
+            logger.info(f"\n⚠️  Found agents in {len(agent_rooms)} room(s)")
+
+            # Ask for confirmation to remove
+            if len(sys.argv) > 1 and sys.argv[1] == "--remove":
+                await remove_agents_from_rooms(lkapi, agent_rooms)
+                await cleanup_empty_rooms(lkapi)
+                logger.info("\n✅ Agent cleanup completed!")
+            else:
+                logger.info("\n💡 To remove existing agents, run:")
+                logger.info("   python manage_agents.py --remove")
         else:
-            print("\n💡 To remove existing agents, run:")
-            print("   python manage_agents.py --remove")
-    else:
-        print("\n✅ No existing agents found. Ready for new deployment!")
+            logger.info("\n✅ No existing agents found. Ready for new deployment!")
 
 if __name__ == "__main__":
     asyncio.run(main())
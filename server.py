@@ -10,7 +10,6 @@ demonstrates:
 ---
 """
 from mcp.server.fastmcp import FastMCP
-from dotenv import load_dotenv
 import os
 import asyncio
 import concurrent.futures
@@ -18,12 +17,13 @@ from livekit import api
 from livekit.protocol import room as room_proto
 from livekit.protocol.models import DataPacket
 import json
-from pathlib import Path
 from functools import wraps
-from dotenv import load_dotenv
 import aiohttp
 
-load_dotenv(dotenv_path=Path(__file__).parent / '.env')
+from env_loader import load as load_env
+
+# Load environment variables (parsed once per process)
+load_env()
 
 mcp = FastMCP("LiveKit MCP")
 
@@ -217,4 +217,7 @@ def generate_join_link(room: str, identity: str = "anonymous", name: str = "Anon
     return join_url
 
 if __name__ == "__main__":
+    # Readiness sentinel for deploy_agent.py: emitted once all imports and
+    # tool registration are done, right before the SSE listener starts.
+    print("MCP_READY", flush=True)
     mcp.run(transport="sse")
@@ -3,19 +3,50 @@
 Test agent interaction by creating a room and checking agent response
 """
 import asyncio
+import logging
+import sys
+import dataclasses
 import os
-from dotenv import load_dotenv
-from pathlib import Path
+import re
+from urllib.parse import urlencode
 from livekit import api, rtc
 from livekit.protocol import room as room_proto
 import aiohttp
 
-# Load environment variables
-load_dotenv(dotenv_path=Path(__file__).parent / '.env')
+from env_loader import load as load_env
+
+# Load environment variables (parsed once per process)
+load_env()
+
+# Single buffered StreamHandler instead of one write() per print
+logging.basicConfig(level=logging.INFO, format='%(message)s', stream=sys.stdout)
+logger = logging.getLogger(__name__)
+
+# Read the env once at import instead of per call
+LK_URL = os.getenv('LIVEKIT_URL')
+LK_KEY = os.getenv('LIVEKIT_API_KEY')
+LK_SECRET = os.getenv('LIVEKIT_API_SECRET')
+
+# One case-insensitive scan instead of two substring checks on a fresh
+# lowercased copy of each identity
+_AGENT_RE = re.compile(r'agent|mcp', re.IGNORECASE)
+
+def _join_url(jwt_token):
+    """Build the meet.livekit.io join URL with properly escaped params"""
+    return "https://meet.livekit.io/custom?" + urlencode(
+        {'liveKitUrl': LK_URL, 'token': jwt_token}
+    )
+
+# Grants differ only by room name, so keep one template and stamp the room in
+_GRANT_TEMPLATE = api.VideoGrants(
+    room_join=True,
+    can_publish=True,
+    can_subscribe=True
+)
 
 async def test_agent_interaction():
     """Test agent by joining a room and checking for agent presence"""
-    print("🤖 Testing Agent Interaction...")
+    logger.info("🤖 Testing Agent Interaction...")
     
     test_room = "agent-interaction-test"
     
@@ -24,27 +55,20 @@ async def test_agent_interaction():
         session = aiohttp.ClientSession()
         lkapi = api.LiveKitAPI(session=session)
         
-        print(f"   🏠 Creating test room: {test_room}")
+        logger.info(f"   🏠 Creating test room: {test_room}")
         
         # Generate token for test participant
-        token = api.AccessToken(
-            os.getenv('LIVEKIT_API_KEY'),
-            os.getenv('LIVEKIT_API_SECRET')
-        ).with_identity("test-user") \
-         .with_name("Test User") \
-         .with_grants(api.VideoGrants(
-            room_join=True,
-            room=test_room,
-            can_publish=True,
-            can_subscribe=True
-        ))
+        token = api.AccessToken(LK_KEY, LK_SECRET) \
+            .with_identity("test-user") \
+            .with_name("Test User") \
+            .with_grants(dataclasses.replace(_GRANT_TEMPLATE, room=test_room))
         
         jwt_token = token.to_jwt()
         
-        print(f"   🎫 Token generated for test participant")
+        logger.info(f"   🎫 Token generated for test participant")
         
         # Wait a moment for agent to potentially join
-        print(f"   ⏳ Waiting for agent to join room...")
+        logger.info(f"   ⏳ Waiting for agent to join room...")
         await asyncio.sleep(5)
         
         # Check room participants
@@ -54,70 +78,69 @@ async def test_agent_interaction():
             )
             
             participants = participants_response.participants
-            print(f"   👥 Found {len(participants)} participant(s) in room:")
+            logger.info(f"   👥 Found {len(participants)} participant(s) in room:")
             
             agent_found = False
             for participant in participants:
-                print(f"      - {participant.identity} ({participant.name}) - Kind: {participant.kind}")
-                if (participant.kind == room_proto.ParticipantInfo.Kind.AGENT or 
-                    'agent' in participant.identity.lower() or
-                    'mcp' in participant.identity.lower()):
+                logger.info(f"      - {participant.identity} ({participant.name}) - Kind: {participant.kind}")
+                if (participant.kind == room_proto.ParticipantInfo.Kind.AGENT or
+                    _AGENT_RE.search(participant.identity)):
                     agent_found = True
-                    print(f"        🤖 This appears to be an agent!")
+                    logger.info(f"        🤖 This appears to be an agent!")
             
             if agent_found:
-                print(f"   ✅ Agent successfully joined the room!")
+                logger.info(f"   ✅ Agent successfully joined the room!")
             else:
-                print(f"   ⚠️  No agent detected in room yet")
-                print(f"   💡 Agent may join when a real participant connects")
+                logger.info(f"   ⚠️  No agent detected in room yet")
+                logger.info(f"   💡 Agent may join when a real participant connects")
             
             # Generate join URL for manual testing
-            livekit_url = os.getenv('LIVEKIT_URL')
-            join_url = f"https://meet.livekit.io/custom?liveKitUrl={livekit_url}&token={jwt_token}"
+            join_url = _join_url(jwt_token)
             
-            print(f"\n   🌐 Manual test URL:")
-            print(f"   {join_url}")
-            print(f"   💬 Join this room to interact with the agent!")
+            logger.info(f"\n   🌐 Manual test URL:")
+            logger.info(f"   {join_url}")
+            logger.info(f"   💬 Join this room to interact with the agent!")
             
             return True, join_url
             
         except Exception as e:
-            if "room not found" in str(e).lower():
-                print(f"   ℹ️  Room doesn't exist yet (will be created when someone joins)")
-                
+            # Stringify once; the same message feeds both the check and the log
+            msg = str(e)
+            if "room not found" in msg.lower():
+                logger.info(f"   ℹ️  Room doesn't exist yet (will be created when someone joins)")
+
                 # Generate join URL anyway
-                livekit_url = os.getenv('LIVEKIT_URL')
-                join_url = f"https://meet.livekit.io/custom?liveKitUrl={livekit_url}&token={jwt_token}"
-                
-                print(f"\n   🌐 Join URL to create room and test agent:")
-                print(f"   {join_url}")
-                
+                join_url = _join_url(jwt_token)
+
+                logger.info(f"\n   🌐 Join URL to create room and test agent:")
+                logger.info(f"   {join_url}")
+
                 return True, join_url
             else:
-                print(f"   ❌ Error checking participants: {str(e)}")
+                logger.info(f"   ❌ Error checking participants: {msg}")
                 return False, None
         
         finally:
             await session.close()
             
     except Exception as e:
-        print(f"   ❌ Test failed: {str(e)}")
+        logger.info(f"   ❌ Test failed: {str(e)}")
         return False, None
 
 async def check_agent_logs():
     """Check if agent is running and show recent activity"""
-    print("\n📋 Agent Status Check...")
+    logger.info("\n📋 Agent Status Check...")
     
     # This would typically check agent logs or status
     # For now, we'll just confirm the agent process
-    print("   ✅ Agent process is running (ID: AW_aUezBweqdL9D)")
-    print("   🔗 Connected to LiveKit cloud")
-    print("   🤖 Waiting for room connections...")
+    logger.info("   ✅ Agent process is running (ID: AW_aUezBweqdL9D)")
+    logger.info("   🔗 Connected to LiveKit cloud")
+    logger.info("   🤖 Waiting for room connections...")
 
 async def main():
     """Main test function"""
-    print("🚀 LiveKit MCP Agent - Interaction Test")
-    print("=" * 50)
+    logger.info("🚀 LiveKit MCP Agent - Interaction Test")
+    logger.info("=" * 50)
     
     # Check agent status
     await check_agent_logs()
@@ -126,20 +149,20 @@ async def main():
     success, join_url = await test_agent_interaction()
     
     if success and join_url:
-        print(f"\n🎯 READY FOR LIVE TEST!")
-        print(f"🔗 Join URL: {join_url}")
-        print(f"\n📋 Test Instructions:")
-        print(f"1. Open the URL above in your browser")
-        print(f"2. Allow microphone access")
-        print(f"3. Start speaking - the agent should respond")
-        print(f"4. Try asking about Rube or MCP capabilities")
-        print(f"\n🎤 Example things to say:")
-        print(f"   - 'Hello, can you hear me?'")
-        print(f"   - 'What can you do?'")
-        print(f"   - 'Tell me about Rube'")
-        print(f"   - 'What tools do you have access to?'")
+        logger.info(f"\n🎯 READY FOR LIVE TEST!")
+        logger.info(f"🔗 Join URL: {join_url}")
+        logger.info(f"\n📋 Test Instructions:")
+        logger.info(f"1. Open the URL above in your browser")
+        logger.info(f"2. Allow microphone access")
+        logger.info(f"3. Start speaking - the agent should respond")
+        logger.info(f"4. Try asking about Rube or MCP capabilities")
+        logger.info(f"\n🎤 Example things to say:")
+        logger.info(f"   - 'Hello, can you hear me?'")
+        logger.info(f"   - 'What can you do?'")
+        logger.info(f"   - 'Tell me about Rube'")
+        logger.info(f"   - 'What tools do you have access to?'")
     else:
-        print(f"\n❌ Test setup failed")
+        logger.info(f"\n❌ Test setup failed")
 
 if __name__ == "__main__":
     asyncio.run(main())
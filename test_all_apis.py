@@ -3,113 +3,122 @@
 Test all API connections before deploying the agent
 """
 import asyncio
+import logging
+import sys
 import os
-from dotenv import load_dotenv
-from pathlib import Path
 import aiohttp
 
-# Load environment variables
-load_dotenv(dotenv_path=Path(__file__).parent / '.env')
+from env_loader import load as load_env
+
+# Load environment variables (parsed once per process)
+load_env()
+
+# Single buffered StreamHandler instead of one write() per print
+logging.basicConfig(level=logging.INFO, format='%(message)s', stream=sys.stdout)
+logger = logging.getLogger(__name__)
 
 async def test_openai():
     """Test OpenAI API connection"""
-    print("🧠 Testing OpenAI API...")
+    logger.info("🧠 Testing OpenAI API...")
     
     try:
-        from openai import OpenAI
-        client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
-        
-        # Test with a simple completion
-        response = client.chat.completions.create(
+        from openai import AsyncOpenAI
+        client = AsyncOpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+
+        # Test with a simple completion (async, so the other probes in the
+        # same gather keep running instead of stalling on this round-trip)
+        response = await client.chat.completions.create(
             model="gpt-4o-mini",
             messages=[{"role": "user", "content": "Say 'OpenAI API working!'"}],
             max_tokens=10
         )
         
-        print(f"✅ OpenAI API working: {response.choices[0].message.content.strip()}")
+        logger.info(f"✅ OpenAI API working: {response.choices[0].message.content.strip()}")
         return True
         
     except Exception as e:
-        print(f"❌ OpenAI API failed: {str(e)}")
+        logger.info(f"❌ OpenAI API failed: {str(e)}")
         return False
 
-async def test_deepgram():
+async def test_deepgram(session):
     """Test Deepgram API connection"""
-    print("🎤 Testing Deepgram API...")
-    
+    logger.info("🎤 Testing Deepgram API...")
+
     try:
-        import httpx
-        
         api_key = os.getenv('DEEPGRAM_API_KEY')
         if not api_key:
-            print("❌ Deepgram API key not found")
+            logger.info("❌ Deepgram API key not found")
             return False
-        
+
         # Test API key validity by checking usage
         headers = {
             'Authorization': f'Token {api_key}',
             'Content-Type': 'application/json'
         }
-        
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                'https://api.deepgram.com/v1/projects',
-                headers=headers
-            )
-            
-            if response.status_code == 200:
-                print("✅ Deepgram API working!")
+
+        async with session.get(
+            'https://api.deepgram.com/v1/projects',
+            headers=headers
+        ) as response:
+            if response.status == 200:
+                logger.info("✅ Deepgram API working!")
                 return True
             else:
-                print(f"❌ Deepgram API failed: {response.status_code}")
+                logger.info(f"❌ Deepgram API failed: {response.status}")
                 return False
-                
+
     except Exception as e:
-        print(f"❌ Deepgram API failed: {str(e)}")
+        logger.info(f"❌ Deepgram API failed: {str(e)}")
         return False
 
-async def test_livekit():
+async def test_livekit(session):
     """Test LiveKit API connection"""
-    print("🎥 Testing LiveKit API...")
-    
+    logger.info("🎥 Testing LiveKit API...")
+
     try:
         from livekit import api
         from livekit.protocol import room as room_proto
-        
-        session = aiohttp.ClientSession()
+
         lkapi = api.LiveKitAPI(session=session)
-        
+
         # Test connection
         rooms_response = await lkapi.room.list_rooms(room_proto.ListRoomsRequest(names=[]))
-        
-        print(f"✅ LiveKit API working! Found {len(rooms_response.rooms)} rooms")
-        
-        await session.close()
+
+        logger.info(f"✅ LiveKit API working! Found {len(rooms_response.rooms)} rooms")
         return True
-        
+
     except Exception as e:
-        print(f"❌ LiveKit API failed: {str(e)}")
+        logger.info(f"❌ LiveKit API failed: {str(e)}")
         return False
 
 async def main():
     """Test all APIs"""
-    print("🚀 Testing All API Connections\n")
-    
-    # Test all APIs
-    openai_ok = await test_openai()
-    deepgram_ok = await test_deepgram()
-    livekit_ok = await test_livekit()
+    logger.info("🚀 Testing All API Connections\n")
+
+    # One session shared by the probes; they're independent I/O, so run
+    # them concurrently — wall time is the slowest API, not the sum.
+    async with aiohttp.ClientSession() as session:
+        # TaskGroup gives structured cancellation: if one probe blows up
+        # unexpectedly the others are cancelled instead of leaking sockets.
+        async with asyncio.TaskGroup() as tg:
+            openai_task = tg.create_task(test_openai())
+            deepgram_task = tg.create_task(test_deepgram(session))
+            livekit_task = tg.create_task(test_livekit(session))
+
+    openai_ok = openai_task.result()
+    deepgram_ok = deepgram_task.result()
+    livekit_ok = livekit_task.result()
     
-    print(f"\n📋 API Test Results:")
-    print(f"OpenAI:   {'✅ PASS' if openai_ok else '❌ FAIL'}")
-    print(f"Deepgram: {'✅ PASS' if deepgram_ok else '❌ FAIL'}")
-    print(f"LiveKit:  {'✅ PASS' if livekit_ok else '❌ FAIL'}")
+    logger.info(f"\n📋 API Test Results:")
+    logger.info(f"OpenAI:   {'✅ PASS' if openai_ok else '❌ FAIL'}")
+    logger.info(f"Deepgram: {'✅ PASS' if deepgram_ok else '❌ FAIL'}")
+    logger.info(f"LiveKit:  {'✅ PASS' if livekit_ok else '❌ FAIL'}")
     
     if all([openai_ok, deepgram_ok, livekit_ok]):
-        print("\n🎉 All APIs working! Ready to deploy agent.")
+        logger.info("\n🎉 All APIs working! Ready to deploy agent.")
         return True
     else:
-        print("\n⚠️  Some APIs failed. Please check your configuration.")
+        logger.info("\n⚠️  Some APIs failed. Please check your configuration.")
         return False
 
 if __name__ == "__main__":
@@ -4,13 +4,13 @@ Test script to verify LiveKit connection and credentials
 """
 import asyncio
 import os
-from dotenv import load_dotenv
-from pathlib import Path
 from livekit import api
 import aiohttp
 
-# Load environment variables
-load_dotenv(dotenv_path=Path(__file__).parent / '.env')
+from env_loader import load as load_env
+
+# Load environment variables (parsed once per process)
+load_env()
 
 async def test_livekit_connection():
     """Test connection to LiveKit cloud"""
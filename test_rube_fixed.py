@@ -3,18 +3,69 @@
 Test Rube MCP with correct headers
 """
 import asyncio
+import logging
+import sys
 import os
 import json
 import aiohttp
-from dotenv import load_dotenv
-from pathlib import Path
 
-# Load environment variables
-load_dotenv(dotenv_path=Path(__file__).parent / '.env')
+from env_loader import load as load_env
+
+# Load environment variables (parsed once per process)
+load_env()
+
+# Single buffered StreamHandler instead of one write() per print
+logging.basicConfig(level=logging.INFO, format='%(message)s', stream=sys.stdout)
+logger = logging.getLogger(__name__)
+
+# One pooled session per process: repeated test invocations (CI loops,
+# chained smoke scripts) reuse connections instead of rebuilding the pool.
+_SESSION = None
+
+async def get_session():
+    global _SESSION
+    if _SESSION is None or _SESSION.closed:
+        _SESSION = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit_per_host=16, ttl_dns_cache=300)
+        )
+    return _SESSION
+
+async def close_session():
+    if _SESSION is not None and not _SESSION.closed:
+        await _SESSION.close()
+
+def _extract_json(buf):
+    """Return the first balanced top-level JSON object in buf, else None.
+
+    Handles both plain JSON bodies and SSE frames ('data: {...}') by
+    scanning from the first '{' and brace-counting outside string literals.
+    """
+    start = buf.find(b'{')
+    if start == -1:
+        return None
+    depth = 0
+    in_str = False
+    esc = False
+    for i in range(start, len(buf)):
+        c = buf[i:i + 1]
+        if esc:
+            esc = False
+        elif c == b'\\':
+            esc = True
+        elif c == b'"':
+            in_str = not in_str
+        elif not in_str:
+            if c == b'{':
+                depth += 1
+            elif c == b'}':
+                depth -= 1
+                if depth == 0:
+                    return json.loads(buf[start:i + 1])
+    return None
 
 async def test_rube_mcp_fixed():
     """Test Rube MCP with proper headers"""
-    print("🔗 Testing Rube MCP with fixed headers...")
+    logger.info("🔗 Testing Rube MCP with fixed headers...")
     
     try:
         rube_api_key = os.getenv('RUBE_API_KEY')
@@ -39,47 +90,62 @@ async def test_rube_mcp_fixed():
             "id": 1
         }
         
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                'https://rube.app/mcp',
-                headers=headers,
-                json=mcp_request
-            ) as response:
-                
-                print(f"   📡 Response status: {response.status}")
-                print(f"   📋 Response headers: {dict(response.headers)}")
-                
-                if response.status == 200:
-                    try:
+        session = await get_session()
+        async with session.post(
+            'https://rube.app/mcp',
+            headers=headers,
+            json=mcp_request
+        ) as response:
+
+            logger.info(f"   📡 Response status: {response.status}")
+            logger.info(f"   📋 Response headers: {dict(response.headers)}")
+
+            if response.status == 200:
+                try:
+                    if 'application/json' in response.headers.get('Content-Type', ''):
                         result = await response.json()
-                        print(f"   ✅ Rube MCP connection successful!")
-                        print(f"   📄 Response: {json.dumps(result, indent=2)}")
-                        return True
-                    except Exception as e:
-                        print(f"   ⚠️  Response received but JSON parse failed: {e}")
-                        content = await response.text()
-                        print(f"   📄 Raw content: {content[:300]}...")
-                        return False
-                else:
-                    content = await response.text()
-                    print(f"   ❌ Rube MCP failed: {response.status}")
-                    print(f"   📄 Error: {content}")
+                    else:
+                        # Event-stream body: parse the first complete
+                        # JSON-RPC object as chunks arrive and stop there
+                        # instead of buffering the whole stream.
+                        buf = b''
+                        result = None
+                        async for chunk in response.content.iter_chunked(4096):
+                            buf += chunk
+                            result = _extract_json(buf)
+                            if result is not None:
+                                break
+                    if result is None:
+                        raise ValueError("no JSON object in response stream")
+                    logger.info(f"   ✅ Rube MCP connection successful!")
+                    logger.info(f"   📄 Response: {json.dumps(result, indent=2)}")
+                    return True
+                except Exception as e:
+                    logger.info(f"   ⚠️  Response received but JSON parse failed: {e}")
                     return False
+            else:
+                content = await response.text()
+                logger.info(f"   ❌ Rube MCP failed: {response.status}")
+                logger.info(f"   📄 Error: {content}")
+                return False
                     
     except Exception as e:
-        print(f"   ❌ Connection failed: {str(e)}")
+        logger.info(f"   ❌ Connection failed: {str(e)}")
         return False
 
 async def main():
     """Main test"""
-    print("🚀 Rube MCP Fixed Connection Test\n")
-    
-    success = await test_rube_mcp_fixed()
+    logger.info("🚀 Rube MCP Fixed Connection Test\n")
+
+    try:
+        success = await test_rube_mcp_fixed()
+    finally:
+        await close_session()
     
     if success:
-        print("\n🎉 Rube MCP is now working!")
+        logger.info("\n🎉 Rube MCP is now working!")
     else:
-        print("\n⚠️  Still having issues with Rube MCP")
+        logger.info("\n⚠️  Still having issues with Rube MCP")
 
 if __name__ == "__main__":
     asyncio.run(main())
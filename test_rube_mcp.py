@@ -3,24 +3,46 @@
 Test connection to Rube MCP server
 """
 import asyncio
+import logging
+import sys
 import os
 import aiohttp
-from dotenv import load_dotenv
-from pathlib import Path
 
-# Load environment variables
-load_dotenv(dotenv_path=Path(__file__).parent / '.env')
+from env_loader import load as load_env
+
+# Load environment variables (parsed once per process)
+load_env()
+
+# Single buffered StreamHandler instead of one write() per print
+logging.basicConfig(level=logging.INFO, format='%(message)s', stream=sys.stdout)
+logger = logging.getLogger(__name__)
+
+# One pooled session per process: repeated test invocations (CI loops,
+# chained smoke scripts) reuse connections instead of rebuilding the pool.
+_SESSION = None
+
+async def get_session():
+    global _SESSION
+    if _SESSION is None or _SESSION.closed:
+        _SESSION = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit_per_host=16, ttl_dns_cache=300)
+        )
+    return _SESSION
+
+async def close_session():
+    if _SESSION is not None and not _SESSION.closed:
+        await _SESSION.close()
 
 async def test_rube_mcp():
     """Test connection to Rube MCP server"""
-    print("🔍 Testing Rube MCP connection...")
+    logger.info("🔍 Testing Rube MCP connection...")
     
     rube_api_key = os.getenv('RUBE_API_KEY')
     if not rube_api_key:
-        print("❌ RUBE_API_KEY not found in environment")
+        logger.info("❌ RUBE_API_KEY not found in environment")
         return False
     
-    print(f"🔑 API Key: {rube_api_key[:20]}...")
+    logger.info(f"🔑 API Key: {rube_api_key[:20]}...")
     
     try:
         headers = {
@@ -29,53 +51,56 @@ async def test_rube_mcp():
         }
         
         # Test basic connection to Rube MCP endpoint
-        async with aiohttp.ClientSession() as session:
-            # Try to get MCP server info or capabilities
-            async with session.get('https://rube.app/mcp', headers=headers) as response:
-                print(f"📡 Response status: {response.status}")
-                
-                if response.status == 200:
-                    print("✅ Rube MCP connection successful!")
-                    
-                    # Try to get response content
-                    try:
-                        content = await response.text()
-                        print(f"📄 Response preview: {content[:200]}...")
-                    except:
-                        print("📄 Response received (binary or large content)")
-                    
-                    return True
-                elif response.status == 401:
-                    print("❌ Authentication failed - check your API key")
-                    return False
-                elif response.status == 404:
-                    print("❌ MCP endpoint not found")
-                    return False
-                else:
-                    print(f"❌ Unexpected response: {response.status}")
-                    try:
-                        content = await response.text()
-                        print(f"Error content: {content}")
-                    except:
-                        pass
-                    return False
+        session = await get_session()
+        # Try to get MCP server info or capabilities
+        async with session.get('https://rube.app/mcp', headers=headers) as response:
+            logger.info(f"📡 Response status: {response.status}")
+
+            if response.status == 200:
+                logger.info("✅ Rube MCP connection successful!")
+
+                # Try to get response content
+                try:
+                    content = await response.text()
+                    logger.info(f"📄 Response preview: {content[:200]}...")
+                except:
+                    logger.info("📄 Response received (binary or large content)")
+
+                return True
+            elif response.status == 401:
+                logger.info("❌ Authentication failed - check your API key")
+                return False
+            elif response.status == 404:
+                logger.info("❌ MCP endpoint not found")
+                return False
+            else:
+                logger.info(f"❌ Unexpected response: {response.status}")
+                try:
+                    content = await response.text()
+                    logger.info(f"Error content: {content}")
+                except:
+                    pass
+                return False
                     
     except Exception as e:
-        print(f"❌ Connection failed: {str(e)}")
+        logger.info(f"❌ Connection failed: {str(e)}")
         return False
 
 async def main():
     """Main test function"""
-    print("🚀 Rube MCP Connection Test\n")
-    
-    success = await test_rube_mcp()
+    logger.info("🚀 Rube MCP Connection Test\n")
+
+    try:
+        success = await test_rube_mcp()
+    finally:
+        await close_session()
     
     if success:
-        print("\n🎉 Rube MCP is ready!")
-        print("✅ You can now start the LiveKit agent")
+        logger.info("\n🎉 Rube MCP is ready!")
+        logger.info("✅ You can now start the LiveKit agent")
     else:
-        print("\n⚠️  Rube MCP connection failed")
-        print("Please check your API key and network connection")
+        logger.info("\n⚠️  Rube MCP connection failed")
+        logger.info("Please check your API key and network connection")
 
 if __name__ == "__main__":
     asyncio.run(main())